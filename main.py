@@ -1,72 +1,86 @@
-from typing import Dict, List
-from flask import Flask, request, jsonify
-from pyrogram import Client
+from typing import AsyncIterator, List, Set
+from collections import OrderedDict
+from itertools import chain
+from quart import Quart, Response, request, jsonify
+from pyrogram import Client, raw, utils
 from pyrogram.errors import FloodWait, RPCError
 from uuid import uuid4
+import msgspec
+import asyncio
 import time
 import os
 
-# Flask app setup
-app = Flask(__name__)
+# Quart app setup
+app = Quart(__name__)
+
+# Use environment variables for sensitive data
+API_ID = int(os.environ.get("API_ID", "26512884"))
+API_HASH = os.environ.get("API_HASH", "c3f491cd59af263cfc249d3f93342ef8")
+
+# Bounds concurrent member-fetch round-trips across all requests
+MEMBERS_SEMAPHORE = asyncio.Semaphore(16)
+
+# Maximum number of FloodWait sleeps before giving up on a scan
+MAX_FLOOD_RETRIES = 5
+
+# Longest FloodWait, in seconds, worth sleeping through; longer waits give up instead
+MAX_FLOOD_WAIT = 60
+
+# Page size for messages.GetDialogs; a shorter page means the scan is complete
+DIALOGS_PAGE_SIZE = 100
+
+# Page size for channels.GetParticipants (the server maximum)
+PARTICIPANTS_PAGE_SIZE = 200
+
+# Raw dialog entity classes the bot can no longer access, or that were deleted
+_FORBIDDEN = frozenset(("ChatForbidden", "ChannelForbidden", "ChatEmpty", "UserEmpty"))
+
+# Known chat types; anything else is reported as "unknown"
+_CHAT_TYPE_MAP = {
+    "private": "private",
+    "group": "group",
+    "supergroup": "supergroup",
+    "channel": "channel"
+}
+
+# Streamed /tgusers bodies are flushed once this many bytes are buffered
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Users fetched but not yet streamed; member fetches wait when this many are queued
+USER_QUEUE_SIZE = 1000
+
+# Shared JSON encoder for the data models
+_json_encoder = msgspec.json.Encoder()
+
+# Pyrogram clients keyed by bot token, least recently used first
+CLIENT_POOL_MAX = 64
+CLIENT_POOL_TTL = 600
+_client_pool: OrderedDict[str, "PooledClient"] = OrderedDict()
+_client_pool_lock = asyncio.Lock()
+_client_reaper: asyncio.Task | None = None
 
 # Data models
-class BotInfo:
-    def __init__(self, first_name: str, id: int, username: str):
-        self.first_name = first_name
-        self.id = id
-        self.username = username
-
-class Chat:
-    def __init__(self, id: int, members_count: int | None, title: str, type: str, username: str | None):
-        self.id = id
-        self.members_count = members_count
-        self.title = title
-        self.type = type
-        self.username = username
-
-class User:
-    def __init__(self, id: int, first_name: str | None, last_name: str | None, username: str | None, is_premium: bool):
-        self.id = id
-        self.first_name = first_name
-        self.last_name = last_name
-        self.username = username
-        self.is_premium = is_premium
-
-class BotDataResponse:
-    def __init__(self, bot_info: BotInfo, chats: List[Chat], users: List[User]):
-        self.bot_info = bot_info
-        self.chats = chats
-        self.users = users
-
-    def to_dict(self) -> Dict:
-        return {
-            "bot_info": {
-                "first_name": self.bot_info.first_name,
-                "id": self.bot_info.id,
-                "username": self.bot_info.username
-            },
-            "chats": [
-                {
-                    "id": chat.id,
-                    "members_count": chat.members_count,
-                    "title": chat.title,
-                    "type": chat.type,
-                    "username": chat.username
-                } for chat in self.chats
-            ],
-            "users": [
-                {
-                    "id": user.id,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                    "username": user.username,
-                    "is_premium": user.is_premium
-                } for user in self.users
-            ]
-        }
+class BotInfo(msgspec.Struct, frozen=True):
+    first_name: str
+    id: int
+    username: str
+
+class Chat(msgspec.Struct, frozen=True):
+    id: int
+    members_count: int | None
+    title: str
+    type: str
+    username: str | None
+
+class User(msgspec.Struct, frozen=True):
+    id: int
+    first_name: str | None
+    last_name: str | None
+    username: str | None
+    is_premium: bool
 
 # Helper function to initialize Pyrogram client
-def create_client(bot_token: str, api_id: int, api_hash: str) -> Client:
+async def create_client(bot_token: str, api_id: int, api_hash: str) -> Client:
     try:
         session_name = f"bot_{uuid4().hex}"
         client = Client(
@@ -74,126 +88,495 @@ def create_client(bot_token: str, api_id: int, api_hash: str) -> Client:
             bot_token=bot_token,
             api_id=api_id,
             api_hash=api_hash,
-            in_memory=True
+            in_memory=True,
+            no_updates=True  # Pooled clients outlive the request; this API never handles updates
         )
-        client.start()
+        await client.start()
         return client
     except Exception as e:
         raise Exception(f"Failed to initialize client: {str(e)}")
 
-# Helper function to normalize chat type
+# Helper function to stop a client, ignoring errors from dead connections
+async def stop_client(client: Client) -> None:
+    try:
+        await client.stop()
+    except Exception:
+        pass
+
+# Pool entry for one bot token; leased entries are never stopped
+class PooledClient:
+    def __init__(self, bot_token: str, started: asyncio.Task):
+        self.bot_token = bot_token
+        self.started = started
+        self.last_used = time.monotonic()
+        self.leases = 0
+
+    @property
+    def failed(self) -> bool:
+        return self.started.done() and (self.started.cancelled() or self.started.exception() is not None)
+
+    @property
+    def client(self) -> Client:
+        return self.started.result()
+
+    def is_idle(self, now: float) -> bool:
+        return self.leases == 0 and (self.failed or now - self.last_used >= CLIENT_POOL_TTL)
+
+# Helper function to stop a pooled client once it has started successfully
+async def stop_pooled_client(entry: PooledClient) -> None:
+    if entry.started.done() and not entry.failed:
+        await stop_client(entry.client)
+
+# Helper function to stop pooled clients one after another
+async def stop_pooled_clients(entries: List[PooledClient]) -> None:
+    for entry in entries:
+        await stop_pooled_client(entry)
+
+# Helper function to lease a started client for a token, reusing pooled ones
+async def acquire_client(bot_token: str, api_id: int, api_hash: str) -> PooledClient:
+    retired: List[PooledClient] = []
+    if _client_reaper is None:
+        # The serving hooks never ran (e.g. the Vercel function), so nothing reaps the pool and
+        # the event loop may not outlive the request; use an unpooled client stopped on release
+        entry = PooledClient(bot_token, asyncio.create_task(create_client(bot_token, api_id, api_hash)))
+        entry.leases += 1
+    else:
+        async with _client_pool_lock:
+            now = time.monotonic()
+            entry = _client_pool.get(bot_token)
+            if entry is None or entry.failed or entry.is_idle(now):
+                if entry:
+                    retired.append(entry)
+                # Started outside the lock; concurrent requests for the token await the same task
+                entry = PooledClient(bot_token, asyncio.create_task(create_client(bot_token, api_id, api_hash)))
+                _client_pool[bot_token] = entry
+            entry.leases += 1
+            entry.last_used = now
+            _client_pool.move_to_end(bot_token)
+            for token, old_entry in list(_client_pool.items()):
+                if len(_client_pool) <= CLIENT_POOL_MAX:
+                    break
+                if old_entry.leases == 0:
+                    del _client_pool[token]
+                    retired.append(old_entry)
+    # The lease is held from here on, so anything that can be cancelled must release it
+    try:
+        if retired:
+            # Shielded so a cancelled request still finishes stopping clients already out of the pool
+            await asyncio.shield(stop_pooled_clients(retired))
+        await asyncio.shield(entry.started)
+    except BaseException:
+        await release_client(entry)
+        raise
+    return entry
+
+# Helper function to return a leased client, stopping it if it left the pool while leased
+async def release_client(entry: PooledClient) -> None:
+    stop = False
+    async with _client_pool_lock:
+        entry.leases -= 1
+        entry.last_used = time.monotonic()
+        pooled = _client_pool.get(entry.bot_token) is entry
+        if pooled and entry.failed and entry.leases == 0:
+            del _client_pool[entry.bot_token]
+        stop = not pooled and entry.leases == 0
+    if stop:
+        await stop_pooled_client(entry)
+
+# Helper function to hold a client lease until a started record stream is closed
+async def leased_records(
+    entry: PooledClient,
+    records: AsyncIterator[tuple[str, Chat | User]]
+) -> AsyncIterator[tuple[str, Chat | User]]:
+    try:
+        async for record in records:
+            yield record
+    finally:
+        await records.aclose()
+        await release_client(entry)
+
+# Background task stopping clients that are not leased and have not been used within the TTL
+async def reap_clients() -> None:
+    while True:
+        await asyncio.sleep(CLIENT_POOL_TTL / 4)
+        expired: List[PooledClient] = []
+        async with _client_pool_lock:
+            now = time.monotonic()
+            for token, entry in list(_client_pool.items()):
+                if entry.is_idle(now):
+                    del _client_pool[token]
+                    expired.append(entry)
+        for entry in expired:
+            await stop_pooled_client(entry)
+
+@app.before_serving
+async def start_client_reaper():
+    global _client_reaper
+    _client_reaper = asyncio.create_task(reap_clients())
+
+@app.after_serving
+async def stop_client_pool():
+    global _client_reaper
+    if _client_reaper is not None:
+        _client_reaper.cancel()
+        _client_reaper = None
+    async with _client_pool_lock:
+        entries = list(_client_pool.values())
+        _client_pool.clear()
+    for entry in entries:
+        if not entry.started.done():
+            entry.started.cancel()
+            # Wait for the start to settle; it may still finish and then needs stopping
+            await asyncio.gather(entry.started, return_exceptions=True)
+        await stop_pooled_client(entry)
+
+# Helper function to normalize chat type; raw_chat_type already yields lowercase names
 def normalize_chat_type(raw_type: str) -> str:
-    type_map = {
-        "private": "private",
-        "group": "group",
-        "supergroup": "supergroup",
-        "channel": "channel"
-    }
-    return type_map.get(raw_type.lower(), "unknown")
-
-# Helper function to get chats and users
-def get_chats_and_users(client: Client) -> tuple[List[Chat], List[User]]:
-    chats: Dict[int, Chat] = {}
-    users: Dict[int, User] = {}
+    return _CHAT_TYPE_MAP.get(raw_type, "unknown")
+
+# Helper function to map a raw dialog entity to a Pyrogram chat type name
+def raw_chat_type(chat) -> str:
+    if isinstance(chat, raw.types.User):
+        return "bot" if chat.bot else "private"
+    if isinstance(chat, (raw.types.Channel, raw.types.ChannelForbidden)):
+        return "supergroup" if chat.megagroup else "channel"
+    return "group"
+
+# Helper function to get the marked (Bot API style) id of a raw dialog entity
+def raw_peer_id(chat) -> int | None:
+    if isinstance(chat, (raw.types.User, raw.types.UserEmpty)):
+        return chat.id
+    if isinstance(chat, (raw.types.Channel, raw.types.ChannelForbidden)):
+        return utils.get_channel_id(chat.id)
+    if isinstance(chat, (raw.types.Chat, raw.types.ChatForbidden, raw.types.ChatEmpty)):
+        return -chat.id
+    return None
+
+# Helper function to build a Chat from a raw dialog entity, or None if it is inaccessible
+def build_chat(chat_id: int, raw_chat, forbidden: frozenset = _FORBIDDEN) -> Chat | None:
+    if raw_chat is None or raw_chat.__class__.__name__ in forbidden:
+        return None
+    return Chat(
+        id=chat_id,
+        members_count=getattr(raw_chat, "participants_count", None),
+        title=getattr(raw_chat, "title", None) or getattr(raw_chat, "first_name", None) or "Unknown",
+        type=normalize_chat_type(raw_chat_type(raw_chat)),
+        username=getattr(raw_chat, "username", None)
+    )
+
+# Helper function to queue the members of a basic group not seen yet via raw messages.GetFullChat
+async def fetch_chat_users(client: Client, chat_id: int, user_ids: Set[int], queue: asyncio.Queue) -> None:
+    _User = User
+    flood_retries = 0
+    while True:
+        # Basic groups return all members from one GetFullChat call, so the semaphore is only
+        # held for that call and a FloodWait sleeps outside it. sleep_threshold=0 stops Pyrogram
+        # from sleeping short waits inside invoke while the semaphore is held
+        try:
+            async with MEMBERS_SEMAPHORE:
+                r = await client.invoke(
+                    raw.functions.messages.GetFullChat(chat_id=-chat_id),
+                    sleep_threshold=0
+                )
+        except FloodWait as fw:
+            flood_retries += 1
+            if flood_retries > MAX_FLOOD_RETRIES or fw.value > MAX_FLOOD_WAIT:
+                return  # Skip chats throttled for too long
+            await asyncio.sleep(fw.value + 1)
+            continue
+        except RPCError:
+            return  # Skip inaccessible chats
+        break
+
+    # ChatParticipantsForbidden has no member list
+    users_by_id = {user.id: user for user in r.users}
+    for participant in getattr(r.full_chat.participants, "participants", None) or []:
+        user = users_by_id.get(participant.user_id)
+        if user and user.id not in user_ids:
+            user_ids.add(user.id)
+            await queue.put(_User(
+                id=user.id,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                username=user.username,
+                is_premium=bool(getattr(user, "premium", False))
+            ))
+
+# Helper function to get the user id of a raw channel participant, or None for non-user peers
+def participant_user_id(participant) -> int | None:
+    user_id = getattr(participant, "user_id", None)
+    if user_id is None:
+        # Banned and left participants carry a peer instead of a user_id
+        user_id = getattr(getattr(participant, "peer", None), "user_id", None)
+    return user_id
+
+# Helper function to queue the members of a supergroup or channel via raw channels.GetParticipants
+async def fetch_channel_users(client: Client, chat_id: int, user_ids: Set[int], queue: asyncio.Queue) -> None:
+    _User = User
+    offset = 0
+    flood_retries = 0
+    try:
+        channel = await client.resolve_peer(chat_id)
+    except RPCError:
+        return  # Skip inaccessible chats
+    while True:
+        # Fetch one page of participants; the semaphore is only held for the request itself,
+        # and a FloodWait sleeps outside it before retrying the same page. sleep_threshold=0
+        # stops Pyrogram from sleeping short waits inside invoke while the semaphore is held
+        try:
+            async with MEMBERS_SEMAPHORE:
+                r = await client.invoke(
+                    raw.functions.channels.GetParticipants(
+                        channel=channel,
+                        filter=raw.types.ChannelParticipantsRecent(),
+                        offset=offset,
+                        limit=PARTICIPANTS_PAGE_SIZE,
+                        hash=0
+                    ),
+                    sleep_threshold=0
+                )
+        except FloodWait as fw:
+            flood_retries += 1
+            if flood_retries > MAX_FLOOD_RETRIES or fw.value > MAX_FLOOD_WAIT:
+                return  # Skip chats throttled for too long
+            await asyncio.sleep(fw.value + 1)
+            continue
+        except RPCError:
+            return  # Skip inaccessible chats
+
+        # r.users also holds inviters/promoters/kickers, so emit only the participants themselves
+        users_by_id = {user.id: user for user in r.users}
+        for participant in r.participants:
+            user = users_by_id.get(participant_user_id(participant))
+            if user and user.id not in user_ids:
+                user_ids.add(user.id)
+                await queue.put(_User(
+                    id=user.id,
+                    first_name=user.first_name,
+                    last_name=user.last_name,
+                    username=user.username,
+                    is_premium=bool(getattr(user, "premium", False))
+                ))
+
+        if len(r.participants) < PARTICIPANTS_PAGE_SIZE:
+            break
+        offset += len(r.participants)
+
+# Helper function to stream chats, then users, as ("chat" | "user", record) pairs
+async def get_chats_and_users(client: Client) -> AsyncIterator[tuple[str, Chat | User]]:
+    chat_ids: Set[int] = set()
+    member_chat_ids: List[int] = []
+    flood_retries = 0
+
+    offset_date = 0
+    offset_id = 0
+    offset_peer = raw.types.InputPeerEmpty()
 
     try:
-        # Fetch chats using get_chats
-        for dialog in client.get_dialogs():
-            chat = dialog.chat
-            if hasattr(chat, "id") and chat.id not in chats:
-                chat_type = normalize_chat_type(chat.type.name if hasattr(chat, "type") else "unknown")
-                chats[chat.id] = Chat(
-                    id=chat.id,
-                    members_count=chat.members_count if hasattr(chat, "members_count") else None,
-                    title=chat.title or chat.first_name or "Unknown",
-                    type=chat_type,
-                    username=chat.username if hasattr(chat, "username") else None
+        while True:
+            # Fetch one page of dialogs; a FloodWait retries the same page
+            try:
+                r = await client.invoke(
+                    raw.functions.messages.GetDialogs(
+                        offset_date=offset_date,
+                        offset_id=offset_id,
+                        offset_peer=offset_peer,
+                        limit=DIALOGS_PAGE_SIZE,
+                        hash=0
+                    )
                 )
+            except FloodWait as fw:
+                flood_retries += 1
+                if flood_retries > MAX_FLOOD_RETRIES or fw.value > MAX_FLOOD_WAIT:
+                    raise
+                await asyncio.sleep(fw.value + 1)
+                continue
+
+            entities = {raw_peer_id(entity): entity for entity in chain(r.users, r.chats)}
+
+            for dialog in r.dialogs:
+                chat_id = utils.get_peer_id(dialog.peer)
+                if chat_id in chat_ids:
+                    continue
+                chat = build_chat(chat_id, entities.get(chat_id))
+                if chat is None:
+                    continue  # Skip missing and inaccessible chats
+                chat_ids.add(chat_id)
+                yield "chat", chat
 
                 # Fetch users from chat (if applicable)
-                if chat_type in ["group", "supergroup", "channel"]:
-                    try:
-                        for member in client.get_chat_members(chat.id):
-                            user = member.user
-                            if user and user.id not in users:
-                                users[user.id] = User(
-                                    id=user.id,
-                                    first_name=user.first_name,
-                                    last_name=user.last_name,
-                                    username=user.username,
-                                    is_premium=user.is_premium if hasattr(user, "is_premium") else False
-                                )
-                    except (FloodWait, RPCError):
-                        continue  # Skip inaccessible chats
-
-    except FloodWait as fw:
-        time.sleep(fw.value)
-        return get_chats_and_users(client)
+                if chat.type in ["group", "supergroup", "channel"]:
+                    member_chat_ids.append(chat_id)
+
+            if len(r.dialogs) < DIALOGS_PAGE_SIZE:
+                break
+
+            # Page from the last dialog's top message like Pyrogram's get_dialogs; pinned
+            # dialogs come first regardless of date, so the oldest message is not the offset
+            top_messages = {
+                (utils.get_peer_id(message.peer_id), message.id): message
+                for message in r.messages
+                if not isinstance(message, raw.types.MessageEmpty)
+            }
+            last_dialog, last_message = None, None
+            for dialog in reversed(r.dialogs):
+                last_message = top_messages.get((utils.get_peer_id(dialog.peer), dialog.top_message))
+                if last_message is not None:
+                    last_dialog = dialog
+                    break
+            if last_dialog is None:
+                break  # No top message to page from
+            last_chat_id = utils.get_peer_id(last_dialog.peer)
+            if (last_message.date, last_message.id) == (offset_date, offset_id):
+                break  # No older dialogs to page to
+            offset_date = last_message.date
+            offset_id = last_message.id
+            offset_peer = await client.resolve_peer(last_chat_id)
+    except RPCError:
+        raise  # Reported as a Telegram API error, before or during the stream
     except Exception as e:
         raise Exception(f"Error fetching chats and users: {str(e)}")
 
-    return list(chats.values()), list(users.values())
+    # Fetch members of all chats concurrently, yielding users as they arrive
+    user_ids: Set[int] = set()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=USER_QUEUE_SIZE)
+    fetch_done = False
+
+    def on_fetch_done(_) -> None:
+        # Never block here: a full queue is drained below and fetch_done ends the loop
+        nonlocal fetch_done
+        fetch_done = True
+        if not queue.full():
+            queue.put_nowait(None)
+
+    fetch = asyncio.gather(
+        *(
+            (fetch_channel_users if utils.get_peer_type(chat_id) == "channel" else fetch_chat_users)(
+                client, chat_id, user_ids, queue
+            )
+            for chat_id in member_chat_ids
+        ),
+        return_exceptions=True
+    )
+    fetch.add_done_callback(on_fetch_done)
+    try:
+        while not (fetch_done and queue.empty()):
+            user = await queue.get()
+            if user is None:
+                break
+            yield "user", user
+    finally:
+        fetch.cancel()
+
+    # Fetchers already skip Telegram errors per chat, so anything left is a real failure
+    for result in fetch.result():
+        if isinstance(result, Exception):
+            raise result
+
+# Helper function to stream bot info, chats and users as a single JSON object
+async def stream_bot_data(
+    bot_info: BotInfo,
+    first: tuple[str, Chat | User] | None,
+    records: AsyncIterator[tuple[str, Chat | User]]
+) -> AsyncIterator[bytes]:
+    buffer = bytearray(b'{"bot_info":')
+    _json_encoder.encode_into(bot_info, buffer, -1)
+    buffer += b',"chats":['
+    section = "chat"
+    separator = b""
+    record = first
+    error = None
+    try:
+        while record is not None:
+            kind, item = record
+            if kind != section:
+                buffer += b'],"users":['
+                section = kind
+                separator = b""
+            buffer += separator
+            _json_encoder.encode_into(item, buffer, -1)
+            separator = b","
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+            record = await anext(records, None)
+    except RPCError as e:
+        error = f"Telegram API error: {str(e)}"
+    except Exception as e:
+        error = f"Internal server error: {str(e)}"
+    finally:
+        await records.aclose()
+
+    # The status is already sent, so a failed scan still ends with a valid object
+    if section == "chat":
+        buffer += b'],"users":['
+    buffer += b"]"
+    if error is not None:
+        buffer += b',"error":'
+        _json_encoder.encode_into(error, buffer, -1)
+    buffer += b"}"
+    yield bytes(buffer)
 
 # API endpoint for root/info
+_INFO_BODY = _json_encoder.encode({
+    "api_name": "Telegram Users API",
+    "version": "1.0.0",
+    "description": "API for retrieving Telegram bot data including chats and users",
+    "owners": [
+        {"username": "@ISmartCoder"},
+        {"username": "@theSmartDev"}
+    ],
+    "endpoints": [
+        {
+            "path": "/tgusers",
+            "method": "GET",
+            "description": "Fetch bot data including bot info, chats, and users",
+            "parameters": [
+                {
+                    "name": "token",
+                    "type": "string",
+                    "required": True,
+                    "description": "Telegram Bot Token"
+                }
+            ]
+        },
+        {
+            "path": "/docs",
+            "method": "GET",
+            "description": "Get API documentation and basic tutorial",
+            "parameters": []
+        }
+    ],
+    "contact": "Contact @ISmartCoder or @theSmartDev for support"
+})
+
 @app.route('/', methods=['GET'])
-def get_api_info():
-    return jsonify({
-        "api_name": "Telegram Users API",
-        "version": "1.0.0",
-        "description": "API for retrieving Telegram bot data including chats and users",
-        "owners": [
-            {"username": "@ISmartCoder"},
-            {"username": "@theSmartDev"}
-        ],
-        "endpoints": [
-            {
-                "path": "/tgusers",
-                "method": "GET",
-                "description": "Fetch bot data including bot info, chats, and users",
-                "parameters": [
-                    {
-                        "name": "token",
-                        "type": "string",
-                        "required": True,
-                        "description": "Telegram Bot Token"
-                    }
-                ]
-            },
-            {
-                "path": "/docs",
-                "method": "GET",
-                "description": "Get API documentation and basic tutorial",
-                "parameters": []
-            }
-        ],
-        "contact": "Contact @ISmartCoder or @theSmartDev for support"
-    })
+async def get_api_info():
+    return Response(_INFO_BODY, 200, {"Content-Type": "application/json"})
 
 # API endpoint for documentation
-@app.route('/docs', methods=['GET'])
-def get_docs():
-    return jsonify({
-        "title": "Telegram Users API Tutorial",
-        "version": "1.0.0",
-        "overview": "This API allows you to retrieve information about a Telegram bot's chats and users using a valid bot token.",
-        "getting_started": {
-            "step_1": {
-                "title": "Obtain a Bot Token",
-                "description": "Create a bot using @BotFather on Telegram to get a bot token."
-            },
-            "step_2": {
-                "title": "Make a Request",
-                "description": "Use the /tgusers endpoint with your bot token as a query parameter.",
-                "example": "GET /tgusers?token=your_bot_token_here"
-            },
-            "step_3": {
-                "title": "Handle Response",
-                "description": "The API returns a JSON object containing bot_info, chats, and users."
-            }
+_DOCS_BODY = _json_encoder.encode({
+    "title": "Telegram Users API Tutorial",
+    "version": "1.0.0",
+    "overview": "This API allows you to retrieve information about a Telegram bot's chats and users using a valid bot token.",
+    "getting_started": {
+        "step_1": {
+            "title": "Obtain a Bot Token",
+            "description": "Create a bot using @BotFather on Telegram to get a bot token."
+        },
+        "step_2": {
+            "title": "Make a Request",
+            "description": "Use the /tgusers endpoint with your bot token as a query parameter.",
+            "example": "GET /tgusers?token=your_bot_token_here"
         },
-        "example_request": {
-            "curl": "curl -X GET 'http://your-api-domain/tgusers?token=your_bot_token_here'",
-            "python": """
+        "step_3": {
+            "title": "Handle Response",
+            "description": "The API returns a JSON object containing bot_info, chats, and users."
+        }
+    },
+    "example_request": {
+        "curl": "curl -X GET 'http://your-api-domain/tgusers?token=your_bot_token_here'",
+        "python": """
 import requests
 
 url = "http://your-api-domain/tgusers"
@@ -202,68 +585,74 @@ response = requests.get(url, params=params)
 data = response.json()
 print(data)
 """
+    },
+    "response_format": {
+        "bot_info": {
+            "first_name": "string",
+            "id": "integer",
+            "username": "string"
         },
-        "response_format": {
-            "bot_info": {
-                "first_name": "string",
+        "chats": [
+            {
                 "id": "integer",
-                "username": "string"
-            },
-            "chats": [
-                {
-                    "id": "integer",
-                    "members_count": "integer or null",
-                    "title": "string",
-                    "type": "string",
-                    "username": "string or null"
-                }
-            ],
-            "users": [
-                {
-                    "id": "integer",
-                    "first_name": "string or null",
-                    "last_name": "string or null",
-                    "username": "string or null",
-                    "is_premium": "boolean"
-                }
-            ]
-        },
-        "notes": [
-            "Ensure your bot token is kept secure",
-            "Rate limits may apply due to Telegram API restrictions",
-            "Contact @ISmartCoder or @theSmartDev for support"
-        ]
-    })
+                "members_count": "integer or null",
+                "title": "string",
+                "type": "string",
+                "username": "string or null"
+            }
+        ],
+        "users": [
+            {
+                "id": "integer",
+                "first_name": "string or null",
+                "last_name": "string or null",
+                "username": "string or null",
+                "is_premium": "boolean"
+            }
+        ],
+        "error": "string (optional; present only if the scan failed after the response started)"
+    },
+    "notes": [
+        "A 200 response that includes an error field is incomplete: chats and users hold only what was fetched before the failure",
+        "Ensure your bot token is kept secure",
+        "Rate limits may apply due to Telegram API restrictions",
+        "Contact @ISmartCoder or @theSmartDev for support"
+    ]
+})
+
+@app.route('/docs', methods=['GET'])
+async def get_docs():
+    return Response(_DOCS_BODY, 200, {"Content-Type": "application/json"})
 
 # API endpoint to fetch bot data
 @app.route('/tgusers', methods=['GET'])
-def get_bot_data():
+async def get_bot_data():
     try:
         bot_token = request.args.get('token')
         if not bot_token:
             return jsonify({"error": "Bot token is required"}), 400
 
-        # Use environment variables for sensitive data
-        api_id = int(os.environ.get("API_ID", "26512884"))
-        api_hash = os.environ.get("API_HASH", "c3f491cd59af263cfc249d3f93342ef8")
-
-        client = create_client(bot_token, api_id, api_hash)
-        me = client.get_me()
+        entry = await acquire_client(bot_token, API_ID, API_HASH)
+        try:
+            me = await entry.client.get_me()
+        except BaseException:
+            await release_client(entry)
+            raise
         bot_info = BotInfo(
             first_name=me.first_name,
             id=me.id,
             username=me.username
         )
 
-        chats, users = get_chats_and_users(client)
-        client.stop()
+        # Pull the first record up front so scan failures still map to an error status;
+        # the lease is released once the stream is closed or exhausted
+        records = leased_records(entry, get_chats_and_users(entry.client))
+        first = await anext(records, None)
 
-        response = BotDataResponse(
-            bot_info=bot_info,
-            chats=chats,
-            users=users
-        )
-        return jsonify(response.to_dict())
+        response = Response(stream_bot_data(bot_info, first, records), 200, {"Content-Type": "application/json"})
+        # Scans can outlast Quart's default RESPONSE_TIMEOUT, which would truncate the body
+        response.timeout = None
+        return response
 
     except RPCError as e:
         return jsonify({"error": f"Telegram API error: {str(e)}"}), 400
@@ -271,4 +660,17 @@ def get_bot_data():
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=8000)
+    # Serves the app in this process, on uvloop where it is installed; for a
+    # deployment use: hypercorn main:app --bind 0.0.0.0:8000 --worker-class uvloop
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass  # uvloop is not available on Windows
+
+    config = Config()
+    config.bind = ["0.0.0.0:8000"]
+    asyncio.run(serve(app, config))